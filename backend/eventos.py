@@ -0,0 +1,161 @@
+"""
+Eventos de alteração enviados aos painéis por Server-Sent Events (GET /eventos).
+
+As rotas que alteram dados registram o evento na sessão; ele só sai depois do commit. Cada
+processo da API mantém as conexões SSE abertas nele em um DifusorEventos (uma fila asyncio por
+conexão). Com PostgreSQL o evento é publicado com pg_notify dentro da própria transação e cada
+worker escuta o canal com LISTEN, então uma alteração feita em qualquer worker (ou em scripts)
+chega a todos os painéis do usuário. Sem PostgreSQL a entrega fica restrita ao processo.
+
+Quando a fila de uma conexão enche, ou o LISTEN precisa reconectar, os eventos pendentes são
+trocados por um único "sincronizar" e o cliente recarrega tudo.
+
+Variáveis de ambiente:
+    EVENTOS_FILA_MAX        eventos pendentes por conexão antes de pedir ressincronização
+    EVENTOS_HEARTBEAT_S     intervalo dos comentários de keep-alive do stream
+    EVENTOS_DATABASE_URL    conexão usada no LISTEN (padrão: DATABASE_URL). Com PgBouncer em modo
+                            transaction aponte direto para o PostgreSQL, pois LISTEN precisa de sessão.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+
+import orjson
+
+EVENTOS_FILA_MAX = int(os.getenv("EVENTOS_FILA_MAX", "100"))
+EVENTOS_HEARTBEAT_S = float(os.getenv("EVENTOS_HEARTBEAT_S", "15"))
+CANAL_POSTGRES = "contas_eventos"
+EVENTO_SINCRONIZAR = {"tipo": "sincronizar", "recursos": []}
+
+logger = logging.getLogger("contas")
+
+
+def serializar_evento(usuario_id: int, evento: dict) -> str:
+    """Payload do pg_notify (limite de 8000 bytes; os eventos levam só tipo, recursos e ids)"""
+    return orjson.dumps({"usuario_id": usuario_id, "evento": evento}).decode()
+
+
+class DifusorEventos:
+    """Assinaturas SSE deste processo, por usuário. Só o loop da API mexe nas filas; outras
+    threads publicam com call_soon_threadsafe."""
+
+    def __init__(self, fila_max: int):
+        self.fila_max = fila_max
+        self._loop = None
+        self._assinantes = {}  # usuario_id -> {asyncio.Queue}
+        self._lock = threading.Lock()
+        self.entregues = 0
+        self.ressincronizacoes = 0
+
+    def iniciar(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def conexoes(self) -> int:
+        with self._lock:
+            return sum(len(filas) for filas in self._assinantes.values())
+
+    def assinar(self, usuario_id: int) -> asyncio.Queue:
+        fila = asyncio.Queue(maxsize=self.fila_max)
+        with self._lock:
+            self._assinantes.setdefault(usuario_id, set()).add(fila)
+        return fila
+
+    def cancelar(self, usuario_id: int, fila: asyncio.Queue):
+        with self._lock:
+            filas = self._assinantes.get(usuario_id)
+            if filas is not None:
+                filas.discard(fila)
+                if not filas:
+                    del self._assinantes[usuario_id]
+
+    def entregar(self, usuario_id: int, evento: dict):
+        """Chamado no loop: coloca o evento na fila de cada conexão do usuário"""
+        with self._lock:
+            filas = list(self._assinantes.get(usuario_id, ()))
+        for fila in filas:
+            self._colocar(fila, evento)
+
+    def sincronizar_todos(self):
+        """Chamado no loop quando eventos podem ter sido perdidos (ex.: LISTEN reconectado)"""
+        with self._lock:
+            filas = [fila for filas in self._assinantes.values() for fila in filas]
+        for fila in filas:
+            self._ressincronizar(fila)
+
+    def publicar(self, usuario_id: int, evento: dict):
+        """Publicação local, segura para chamar de qualquer thread (ex.: rotas no threadpool)"""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self.entregar, usuario_id, evento)
+
+    def receber_notificacao(self, payload: str):
+        try:
+            mensagem = orjson.loads(payload)
+            self.entregar(mensagem["usuario_id"], mensagem["evento"])
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            logger.warning("Notificação de evento inválida", extra={"campos": {"payload": payload[:200]}})
+
+    def _colocar(self, fila: asyncio.Queue, evento: dict):
+        try:
+            fila.put_nowait(evento)
+            self.entregues += 1
+        except asyncio.QueueFull:
+            self._ressincronizar(fila)
+
+    def _ressincronizar(self, fila: asyncio.Queue):
+        while not fila.empty():
+            fila.get_nowait()
+        fila.put_nowait(EVENTO_SINCRONIZAR)
+        self.ressincronizacoes += 1
+
+
+async def escutar_postgres(difusor: DifusorEventos, url: str, canal: str = CANAL_POSTGRES, pausa: float = 5.0):
+    """Mantém um LISTEN no canal e entrega as notificações (de todos os workers) aos assinantes
+    deste processo. A conexão é lida pelo próprio loop (add_reader), sem thread dedicada."""
+    import psycopg2
+    from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+    loop = asyncio.get_running_loop()
+    reconectando = False
+    while True:
+        conexao = None
+        try:
+            conexao = await loop.run_in_executor(None, psycopg2.connect, url)
+            conexao.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conexao.cursor() as cursor:
+                cursor.execute(f"LISTEN {canal}")
+            if reconectando:
+                difusor.sincronizar_todos()
+            logger.info("Escutando eventos do PostgreSQL", extra={"campos": {"canal": canal}})
+
+            perdida = loop.create_future()
+
+            def ler():
+                try:
+                    conexao.poll()
+                except Exception as erro:
+                    if not perdida.done():
+                        perdida.set_exception(erro)
+                    return
+                while conexao.notifies:
+                    difusor.receber_notificacao(conexao.notifies.pop(0).payload)
+
+            loop.add_reader(conexao.fileno(), ler)
+            try:
+                await perdida
+            finally:
+                loop.remove_reader(conexao.fileno())
+        except asyncio.CancelledError:
+            raise
+        except Exception as erro:
+            logger.warning("Conexão de eventos perdida; reconectando", extra={"campos": {"erro": str(erro)}})
+        finally:
+            if conexao is not None:
+                conexao.close()
+        reconectando = True
+        await asyncio.sleep(pausa)
+
+
+difusor_eventos = DifusorEventos(EVENTOS_FILA_MAX)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Migração de contas e faturas para tabelas particionadas por data_vencimento (PostgreSQL)
+
+Cada tabela é renomeada, recriada com PARTITION BY RANGE (data_vencimento), recebe partições do
+primeiro vencimento existente até PARTICOES_MESES_FUTUROS à frente (mais a partição padrão) e os
+dados são copiados. Tudo roda em uma transação; as tabelas ficam bloqueadas durante a cópia.
+
+Mudanças de esquema exigidas pelo particionamento:
+- a chave primária passa a ser (id, data_vencimento); id continua vindo da mesma sequência
+- chaves estrangeiras que apontam para contas (faturas.conta_id) são removidas, pois o PostgreSQL
+  só aceita FK para tabela particionada com uma chave única que contenha a coluna de partição
+
+Uso (depois de migrate_usuarios.py):
+    python migrate_particoes.py
+"""
+
+import sys
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import create_engine, text
+
+from main import DATABASE_URL, Base
+from particoes import (
+    TABELAS_PARTICIONADAS, COLUNA_PARTICAO, PARTICOES_MESES_FUTUROS,
+    tabela_particionada, criar_particao_padrao, garantir_particoes,
+)
+
+# Chaves estrangeiras recriadas em cada tabela particionada
+CHAVES_ESTRANGEIRAS = {
+    "contas": {
+        "usuario_id": "usuarios",
+        "categoria_id": "categorias",
+        "cartao_id": "cartoes",
+    },
+    "faturas": {
+        "usuario_id": "usuarios",
+        "cartao_id": "cartoes",
+    },
+}
+
+
+def remover_fks_para(connection, tabela):
+    """Remove as FKs de outras tabelas que apontam para a tabela"""
+    restricoes = connection.execute(text("""
+        SELECT conrelid::regclass::text, conname FROM pg_constraint
+        WHERE contype = 'f' AND confrelid = CAST(:tabela AS regclass)
+    """), {"tabela": tabela}).all()
+    for origem, nome in restricoes:
+        print(f"Removendo FK {origem}.{nome} (aponta para {tabela})")
+        connection.execute(text(f"ALTER TABLE {origem} DROP CONSTRAINT {nome}"))
+
+
+def particionar_tabela(connection, tabela, hoje):
+    legado = f"{tabela}_legado"
+    sequencia = connection.execute(text("SELECT pg_get_serial_sequence(:tabela, 'id')"), {"tabela": tabela}).scalar()
+
+    remover_fks_para(connection, tabela)
+    connection.execute(text(f"ALTER TABLE {tabela} RENAME TO {legado}"))
+    connection.execute(text(
+        f"CREATE TABLE {tabela} (LIKE {legado} INCLUDING DEFAULTS) PARTITION BY RANGE ({COLUNA_PARTICAO})"
+    ))
+    if sequencia:
+        connection.execute(text(f"ALTER SEQUENCE {sequencia} OWNED BY {tabela}.id"))
+
+    primeiro = connection.execute(text(f"SELECT min({COLUNA_PARTICAO}) FROM {legado}")).scalar() or hoje
+    criar_particao_padrao(connection, tabela)
+    criadas = garantir_particoes(
+        connection, tabela, min(primeiro, hoje), hoje + relativedelta(months=PARTICOES_MESES_FUTUROS)
+    )
+    print(f"✅ {tabela}: {len(criadas)} partições criadas.")
+
+    copiadas = connection.execute(text(f"INSERT INTO {tabela} SELECT * FROM {legado}")).rowcount
+    connection.execute(text(f"DROP TABLE {legado}"))
+    print(f"✅ {tabela}: {copiadas} registros copiados.")
+
+    # Chave primária, FKs e índices depois da carga (mais rápido que manter durante a cópia)
+    connection.execute(text(f"ALTER TABLE {tabela} ADD CONSTRAINT {tabela}_pkey PRIMARY KEY (id, {COLUNA_PARTICAO})"))
+    for coluna, referencia in CHAVES_ESTRANGEIRAS[tabela].items():
+        connection.execute(text(
+            f"ALTER TABLE {tabela} ADD CONSTRAINT {tabela}_{coluna}_fkey "
+            f"FOREIGN KEY ({coluna}) REFERENCES {referencia}(id)"
+        ))
+    for indice in Base.metadata.tables[tabela].indexes:
+        print(f"Criando índice {indice.name}")
+        indice.create(bind=connection)
+    connection.execute(text(f"ANALYZE {tabela}"))
+
+
+def run_migration():
+    """Converte contas e faturas em tabelas particionadas"""
+
+    if not DATABASE_URL.startswith("postgresql"):
+        print("❌ Particionamento disponível apenas para PostgreSQL")
+        return False
+
+    try:
+        engine = create_engine(DATABASE_URL)
+        hoje = date.today()
+
+        with engine.begin() as connection:
+            for tabela in TABELAS_PARTICIONADAS:
+                if tabela_particionada(connection, tabela):
+                    print(f"✅ {tabela} já é particionada. Nenhuma migração necessária.")
+                    continue
+                print(f"🔎 Particionando {tabela}...")
+                particionar_tabela(connection, tabela, hoje)
+
+    except Exception as e:
+        print(f"❌ Erro na migração: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    print("🔄 Iniciando migração para tabelas particionadas...")
+    success = run_migration()
+
+    if success:
+        print("🎉 Migração concluída com sucesso!")
+    else:
+        print("💥 Falha na migração!")
+        sys.exit(1)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Migração para dados por usuário (usuario_id em categorias, cartões, faturas e contas)
+
+Os dados existentes são atribuídos a um usuário: o informado em --usuario-email ou, se houver
+apenas um cadastrado, esse usuário. Depois a coluna vira NOT NULL, os nomes únicos passam a ser
+únicos por usuário e os índices compostos (começando por usuario_id) são criados. Usuários que
+ficarem sem categorias recebem as categorias padrão.
+
+Rode antes de subir a nova versão da API (o create_all do startup não altera tabelas existentes):
+    python migrate_usuarios.py [--usuario-email admin@exemplo.com]
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import create_engine, text
+
+from main import DATABASE_URL, CATEGORIAS_PADRAO
+
+TABELAS = ["categorias", "cartoes", "faturas", "contas"]
+
+# Restrições de nome único globais, substituídas pelas restrições por usuário
+RESTRICOES_ANTIGAS = {
+    "categorias": "categorias_nome_key",
+    "cartoes": "cartoes_nome_key",
+}
+
+RESTRICOES_NOVAS = {
+    "uq_categorias_usuario_nome": "ALTER TABLE categorias ADD CONSTRAINT uq_categorias_usuario_nome UNIQUE (usuario_id, nome)",
+    "uq_cartoes_usuario_nome": "ALTER TABLE cartoes ADD CONSTRAINT uq_cartoes_usuario_nome UNIQUE (usuario_id, nome)",
+}
+
+INDICES = [
+    "CREATE INDEX IF NOT EXISTS ix_faturas_usuario_vencimento ON faturas (usuario_id, data_vencimento)",
+    "CREATE INDEX IF NOT EXISTS ix_faturas_usuario_cartao_vencimento ON faturas (usuario_id, cartao_id, data_vencimento)",
+    "CREATE INDEX IF NOT EXISTS ix_faturas_conta ON faturas (conta_id)",
+    "CREATE INDEX IF NOT EXISTS ix_contas_usuario_vencimento ON contas (usuario_id, data_vencimento)",
+    "CREATE INDEX IF NOT EXISTS ix_contas_usuario_cartao_vencimento ON contas (usuario_id, cartao_id, data_vencimento)",
+    "CREATE INDEX IF NOT EXISTS ix_contas_usuario_grupo_parcelamento ON contas (usuario_id, grupo_parcelamento)",
+    "CREATE INDEX IF NOT EXISTS ix_contas_usuario_grupo_recorrencia ON contas (usuario_id, grupo_recorrencia)",
+]
+
+
+def obter_usuario_dono(connection, email):
+    """Usuário que recebe os dados existentes"""
+    if email:
+        linha = connection.execute(text("SELECT id FROM usuarios WHERE email = :email"), {"email": email}).first()
+        if not linha:
+            raise RuntimeError(f"Usuário {email} não encontrado")
+        return linha[0]
+
+    ids = [linha[0] for linha in connection.execute(text("SELECT id FROM usuarios ORDER BY id"))]
+    if len(ids) == 1:
+        return ids[0]
+    if not ids:
+        raise RuntimeError("Nenhum usuário cadastrado; crie um usuário antes de migrar")
+    raise RuntimeError(f"Existem {len(ids)} usuários; informe o dono dos dados com --usuario-email")
+
+
+def run_migration(email=None):
+    """Adiciona usuario_id, preenche os dados existentes e cria restrições e índices por usuário"""
+
+    if not DATABASE_URL.startswith("postgresql"):
+        print("❌ Migração disponível apenas para PostgreSQL (no SQLite recrie o banco com 'python main.py init-db')")
+        return False
+
+    try:
+        engine = create_engine(DATABASE_URL)
+
+        # Uma única transação: ou o banco migra por completo ou fica como estava
+        with engine.begin() as connection:
+            usuario_id = obter_usuario_dono(connection, email)
+            print(f"👤 Dados existentes serão atribuídos ao usuário {usuario_id}")
+
+            for tabela in TABELAS:
+                print(f"🔎 Migrando {tabela}...")
+                connection.execute(text(
+                    f"ALTER TABLE {tabela} ADD COLUMN IF NOT EXISTS usuario_id INTEGER REFERENCES usuarios(id)"
+                ))
+                atualizadas = connection.execute(
+                    text(f"UPDATE {tabela} SET usuario_id = :usuario_id WHERE usuario_id IS NULL"),
+                    {"usuario_id": usuario_id}
+                ).rowcount
+                connection.execute(text(f"ALTER TABLE {tabela} ALTER COLUMN usuario_id SET NOT NULL"))
+                print(f"✅ {tabela}: {atualizadas} registros atribuídos.")
+
+            for tabela, restricao in RESTRICOES_ANTIGAS.items():
+                connection.execute(text(f"ALTER TABLE {tabela} DROP CONSTRAINT IF EXISTS {restricao}"))
+
+            existentes = {
+                linha[0] for linha in connection.execute(
+                    text("SELECT conname FROM pg_constraint WHERE conname = ANY(:nomes)"),
+                    {"nomes": list(RESTRICOES_NOVAS)}
+                )
+            }
+            for nome, comando in RESTRICOES_NOVAS.items():
+                if nome not in existentes:
+                    print(f"Executando: {comando}")
+                    connection.execute(text(comando))
+
+            for comando in INDICES:
+                print(f"Executando: {comando}")
+                connection.execute(text(comando))
+
+            # Usuários sem categorias (cadastrados antes da migração) recebem as padrão
+            sem_categorias = [
+                linha[0] for linha in connection.execute(text("""
+                    SELECT u.id FROM usuarios u
+                    WHERE NOT EXISTS (SELECT 1 FROM categorias c WHERE c.usuario_id = u.id)
+                """))
+            ]
+            for outro_id in sem_categorias:
+                connection.execute(
+                    text("INSERT INTO categorias (usuario_id, nome, ativo) VALUES (:usuario_id, :nome, TRUE)"),
+                    [{"usuario_id": outro_id, "nome": nome} for nome in CATEGORIAS_PADRAO]
+                )
+            if sem_categorias:
+                print(f"✅ Categorias padrão criadas para {len(sem_categorias)} usuários.")
+
+            # Os índices novos só ajudam o planner com estatísticas atualizadas
+            for tabela in TABELAS:
+                connection.execute(text(f"ANALYZE {tabela}"))
+
+    except Exception as e:
+        print(f"❌ Erro na migração: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Atribui os dados existentes a um usuário (usuario_id)")
+    parser.add_argument("--usuario-email", help="e-mail do usuário dono dos dados já cadastrados")
+    args = parser.parse_args()
+
+    print("🔄 Iniciando migração para dados por usuário...")
+    success = run_migration(args.usuario_email)
+
+    if success:
+        print("🎉 Migração concluída com sucesso!")
+    else:
+        print("💥 Falha na migração!")
+        sys.exit(1)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Migração para o status "vencido" mantido pelo banco
+
+Cria o índice (status, data_vencimento) usado pela marcação periódica e marca como vencidas as
+contas pendentes que já venceram (o create_all do startup não cria índices em tabelas existentes).
+Depois disso a API mantém o status sozinha (VENCIDOS_INTERVALO_HORAS).
+
+Uso:
+    python migrate_vencidos.py
+"""
+
+import sys
+
+from sqlalchemy import text
+
+from main import engine, marcar_contas_vencidas
+
+INDICE = "CREATE INDEX IF NOT EXISTS ix_contas_status_vencimento ON contas (status, data_vencimento)"
+
+
+def run_migration():
+    """Cria o índice e faz a primeira marcação das contas vencidas"""
+
+    try:
+        with engine.begin() as connection:
+            print(f"Executando: {INDICE}")
+            connection.execute(text(INDICE))
+            if engine.dialect.name == "postgresql":
+                connection.execute(text("ANALYZE contas"))
+
+        atualizadas = marcar_contas_vencidas()
+        print(f"✅ {atualizadas} contas marcadas como vencidas.")
+
+    except Exception as e:
+        print(f"❌ Erro na migração: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    print("🔄 Iniciando migração para o status vencido...")
+    success = run_migration()
+
+    if success:
+        print("🎉 Migração concluída com sucesso!")
+    else:
+        print("💥 Falha na migração!")
+        sys.exit(1)
@@ -0,0 +1,196 @@
+"""
+Particionamento declarativo (PostgreSQL) de contas e faturas por data_vencimento.
+
+As tabelas são convertidas uma única vez com migrate_particoes.py; a partir daí a API cria as
+partições futuras no startup e periodicamente. Cada partição cobre um mês (ou um ano) e uma
+partição padrão recebe o que cair fora dos intervalos criados (ex.: parcelas muito à frente);
+quando a partição do período é criada, essas linhas saem da padrão para ela.
+
+Partições antigas saem da tabela com DETACH PARTITION (só metadados, sem reescrever dados) e
+podem ser arquivadas ou removidas em seguida:
+    python particoes.py manter
+    python particoes.py listar
+    python particoes.py desanexar --antes 2024-01-01 [--remover]
+
+Variáveis de ambiente:
+    PARTICOES_GRANULARIDADE   mes | ano (intervalo de cada partição nova)
+    PARTICOES_MESES_FUTUROS   quantos meses à frente manter com partição criada
+"""
+
+import os
+import re
+import logging
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import text
+
+TABELAS_PARTICIONADAS = ("contas", "faturas")
+COLUNA_PARTICAO = "data_vencimento"
+
+PARTICOES_GRANULARIDADE = os.getenv("PARTICOES_GRANULARIDADE", "mes").strip().lower()
+PARTICOES_MESES_FUTUROS = int(os.getenv("PARTICOES_MESES_FUTUROS", "24"))
+
+logger = logging.getLogger("contas")
+
+_LIMITES = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+
+def inicio_periodo(data: date, granularidade: str = PARTICOES_GRANULARIDADE) -> date:
+    if granularidade == "ano":
+        return date(data.year, 1, 1)
+    return date(data.year, data.month, 1)
+
+
+def proximo_periodo(inicio: date, granularidade: str = PARTICOES_GRANULARIDADE) -> date:
+    return inicio + relativedelta(years=1) if granularidade == "ano" else inicio + relativedelta(months=1)
+
+
+def nome_particao(tabela: str, inicio: date, granularidade: str = PARTICOES_GRANULARIDADE) -> str:
+    if granularidade == "ano":
+        return f"{tabela}_p{inicio.year}"
+    return f"{tabela}_p{inicio.year}_{inicio.month:02d}"
+
+
+def nome_particao_padrao(tabela: str) -> str:
+    return f"{tabela}_padrao"
+
+
+def tabela_particionada(conexao, tabela: str) -> bool:
+    return conexao.execute(text("""
+        SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid
+        WHERE c.relname = :tabela AND c.relnamespace = to_regnamespace(current_schema())
+    """), {"tabela": tabela}).first() is not None
+
+
+def _limite(expressao: str) -> date:
+    expressao = expressao.strip()
+    if expressao == "MINVALUE":
+        return date.min
+    if expressao == "MAXVALUE":
+        return date.max
+    return date.fromisoformat(expressao.strip("'"))
+
+
+def listar_particoes(conexao, tabela: str):
+    """Partições da tabela como (nome, inicio, fim); a partição padrão vem com inicio/fim None"""
+    linhas = conexao.execute(text("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:tabela AS regclass)
+    """), {"tabela": tabela}).all()
+    particoes = []
+    for nome, limites in linhas:
+        encontrado = _LIMITES.search(limites)
+        if encontrado:
+            particoes.append((nome, _limite(encontrado.group(1)), _limite(encontrado.group(2))))
+        else:
+            particoes.append((nome, None, None))
+    return sorted(particoes, key=lambda p: (p[1] is None, p[1] or date.min))
+
+
+def criar_particao_padrao(conexao, tabela: str):
+    conexao.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {nome_particao_padrao(tabela)} PARTITION OF {tabela} DEFAULT"
+    ))
+
+
+def criar_particao(conexao, tabela: str, inicio: date, fim: date, nome: str, padrao: str = None):
+    """Cria a partição [inicio, fim). Com partição padrão, as linhas do período que estavam
+    nela são movidas para a tabela nova antes do ATTACH (que falharia com elas lá)."""
+    limites = f"FROM ('{inicio.isoformat()}') TO ('{fim.isoformat()}')"
+    if padrao is None:
+        conexao.execute(text(f"CREATE TABLE {nome} PARTITION OF {tabela} FOR VALUES {limites}"))
+        return 0
+    conexao.execute(text(f"CREATE TABLE {nome} (LIKE {tabela} INCLUDING DEFAULTS)"))
+    movidas = conexao.execute(text(f"""
+        WITH movidas AS (
+            DELETE FROM {padrao}
+            WHERE {COLUNA_PARTICAO} >= :inicio AND {COLUNA_PARTICAO} < :fim
+            RETURNING *
+        )
+        INSERT INTO {nome} SELECT * FROM movidas
+    """), {"inicio": inicio, "fim": fim}).rowcount
+    conexao.execute(text(f"ALTER TABLE {tabela} ATTACH PARTITION {nome} FOR VALUES {limites}"))
+    return movidas
+
+
+def garantir_particoes(conexao, tabela: str, desde: date, ate: date, granularidade: str = PARTICOES_GRANULARIDADE):
+    """Cria as partições que faltam para cobrir [desde, ate]; retorna os nomes criados"""
+    existentes = listar_particoes(conexao, tabela)
+    intervalos = [(inicio, fim) for _, inicio, fim in existentes if inicio is not None]
+    padrao = next((nome for nome, inicio, _ in existentes if inicio is None), None)
+    criadas = []
+    inicio = inicio_periodo(desde, granularidade)
+    while inicio <= ate:
+        fim = proximo_periodo(inicio, granularidade)
+        # Períodos já cobertos (mesmo que por partição de outra granularidade) ficam como estão
+        if not any(inicio < fim_existente and inicio_existente < fim for inicio_existente, fim_existente in intervalos):
+            nome = nome_particao(tabela, inicio, granularidade)
+            movidas = criar_particao(conexao, tabela, inicio, fim, nome, padrao)
+            intervalos.append((inicio, fim))
+            criadas.append(nome)
+            logger.info("Partição criada", extra={"campos": {"particao": nome, "linhas_movidas": movidas}})
+        inicio = fim
+    return criadas
+
+
+def manter_particoes(conexao, meses_futuros: int = PARTICOES_MESES_FUTUROS, hoje: date = None):
+    """Garante partições do mês atual até meses_futuros à frente nas tabelas já particionadas"""
+    hoje = hoje or date.today()
+    criadas = {}
+    for tabela in TABELAS_PARTICIONADAS:
+        if tabela_particionada(conexao, tabela):
+            criadas[tabela] = garantir_particoes(conexao, tabela, hoje, hoje + relativedelta(months=meses_futuros))
+    return criadas
+
+
+def desanexar_particoes(conexao, tabela: str, antes_de: date, remover: bool = False, apenas_vazias: bool = False):
+    """Tira da tabela as partições que terminam até antes_de. A operação só altera o catálogo;
+    as tabelas desanexadas continuam com os dados (para arquivamento) a menos que remover=True.
+    Com apenas_vazias=True, partições que ainda têm linhas ficam anexadas."""
+    desanexadas = []
+    for nome, _, fim in listar_particoes(conexao, tabela):
+        if fim is None or fim > antes_de:
+            continue
+        if apenas_vazias and conexao.execute(text(f"SELECT 1 FROM {nome} LIMIT 1")).first():
+            continue
+        conexao.execute(text(f"ALTER TABLE {tabela} DETACH PARTITION {nome}"))
+        if remover:
+            conexao.execute(text(f"DROP TABLE {nome}"))
+        desanexadas.append(nome)
+        logger.info("Partição desanexada", extra={"campos": {"particao": nome, "removida": remover}})
+    return desanexadas
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manutenção das partições de contas e faturas")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    comandos.add_parser("manter", help="cria as partições futuras que faltam")
+    comandos.add_parser("listar", help="lista as partições e seus intervalos")
+    desanexar = comandos.add_parser("desanexar", help="desanexa partições antigas")
+    desanexar.add_argument("--antes", required=True, type=date.fromisoformat,
+                           help="desanexa partições que terminam até esta data (AAAA-MM-DD)")
+    desanexar.add_argument("--remover", action="store_true", help="remove as tabelas desanexadas")
+    args = parser.parse_args()
+
+    from main import engine
+
+    with engine.begin() as conexao:
+        if args.comando == "manter":
+            for tabela, criadas in manter_particoes(conexao).items():
+                print(f"{tabela}: {len(criadas)} partições criadas")
+        elif args.comando == "listar":
+            for tabela in TABELAS_PARTICIONADAS:
+                if not tabela_particionada(conexao, tabela):
+                    print(f"{tabela}: não particionada")
+                    continue
+                for nome, inicio, fim in listar_particoes(conexao, tabela):
+                    print(f"{tabela}: {nome} {inicio or 'DEFAULT'} {fim or ''}")
+        else:
+            for tabela in TABELAS_PARTICIONADAS:
+                if tabela_particionada(conexao, tabela):
+                    desanexadas = desanexar_particoes(conexao, tabela, args.antes, args.remover)
+                    print(f"{tabela}: {', '.join(desanexadas) or 'nenhuma partição'} desanexada(s)")
@@ -0,0 +1,143 @@
+"""
+Hash de senhas (bcrypt) em um pool de processos dedicado.
+
+O bcrypt consome ~250 ms de CPU por operação; rodando no threadpool das rotas, uma rajada de
+logins ocupa todas as threads e trava os demais endpoints. Aqui as operações vão para um
+ProcessPoolExecutor pequeno, com limite de operações pendentes (acima dele a chamada falha
+com FilaSenhasCheia, que a API devolve como 503). Se um processo do pool morrer (ex.: OOM killer),
+o pool quebrado é descartado e a operação é repetida uma vez em um pool novo.
+
+Variáveis de ambiente:
+    BCRYPT_ROUNDS     custo do bcrypt (hashes com outro custo são refeitos no login)
+    SENHAS_WORKERS    processos do pool
+    SENHAS_FILA_MAX   operações pendentes (em execução + aguardando) antes de recusar
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from passlib.context import CryptContext
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+SENHAS_WORKERS = int(os.getenv("SENHAS_WORKERS", "2"))
+SENHAS_FILA_MAX = int(os.getenv("SENHAS_FILA_MAX", "32"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+
+class FilaSenhasCheia(Exception):
+    """Há mais operações de senha pendentes do que SENHAS_FILA_MAX"""
+
+
+class PoolSenhasIndisponivel(FilaSenhasCheia):
+    """O pool quebrou de novo logo após ser recriado (também respondida com 503)"""
+
+
+# Executadas nos processos do pool (precisam ser funções de módulo para o pickle)
+def _gerar_hash(senha: str) -> str:
+    return pwd_context.hash(senha)
+
+
+def _verificar_e_atualizar(senha: str, hash_atual: str):
+    return pwd_context.verify_and_update(senha, hash_atual)
+
+
+def _aquecer() -> bool:
+    return True
+
+
+class PoolSenhas:
+    """ProcessPoolExecutor com limite de fila e contadores para /metrics"""
+
+    def __init__(self, workers: int, fila_max: int):
+        self.workers = workers
+        self.fila_max = fila_max
+        self._lock = threading.Lock()
+        self._executor = None
+        self.pendentes = 0
+        self.concluidas = 0
+        self.recusadas = 0
+        self.reinicios = 0
+        self.segundos_total = 0.0
+
+    def _obter_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: os processos não herdam conexões de banco nem threads do servidor
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _descartar_executor(self, executor: ProcessPoolExecutor):
+        """Remove o pool quebrado, se outra chamada ainda não o trocou"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self.reinicios += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def executar(self, funcao, *args):
+        with self._lock:
+            if self.pendentes >= self.fila_max:
+                self.recusadas += 1
+                raise FilaSenhasCheia()
+            self.pendentes += 1
+        inicio = time.perf_counter()
+        try:
+            for tentativa in range(2):
+                executor = self._obter_executor()
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(executor, funcao, *args)
+                except BrokenProcessPool:
+                    self._descartar_executor(executor)
+                    if tentativa:
+                        raise PoolSenhasIndisponivel()
+        finally:
+            with self._lock:
+                self.pendentes -= 1
+                self.concluidas += 1
+                self.segundos_total += time.perf_counter() - inicio
+
+    async def iniciar(self):
+        """Sobe os processos antes do primeiro login"""
+        executor = self._obter_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, _aquecer) for _ in range(self.workers)))
+
+    def encerrar(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def resumo(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "fila_max": self.fila_max,
+                "pendentes": self.pendentes,
+                "concluidas": self.concluidas,
+                "recusadas": self.recusadas,
+                "reinicios": self.reinicios,
+                "segundos_total": round(self.segundos_total, 6),
+            }
+
+
+pool_senhas = PoolSenhas(SENHAS_WORKERS, SENHAS_FILA_MAX)
+
+
+async def gerar_hash(senha: str) -> str:
+    return await pool_senhas.executar(_gerar_hash, senha)
+
+
+async def verificar_senha(senha: str, hash_atual: str):
+    """Retorna (valida, novo_hash). novo_hash vem preenchido quando o hash armazenado usa
+    outro custo/esquema e deve ser substituído."""
+    return await pool_senhas.executar(_verificar_e_atualizar, senha, hash_atual)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Worker da fila de jobs (tabela jobs)
+
+Executa as operações enviadas com assincrono=true (importação de Excel, exclusão de cartão com
+histórico, arquivamento). Cada thread reserva um job por vez com SELECT ... FOR UPDATE SKIP
+LOCKED, então vários workers (threads, processos ou máquinas) dividem a fila sem se bloquear;
+para ganhar vazão basta subir mais workers. Jobs que falham voltam para a fila com backoff
+exponencial até JOBS_MAX_TENTATIVAS. Enquanto um job roda, o worker renova a reserva a cada
+JOBS_HEARTBEAT_S; jobs presos em um worker encerrado no meio voltam para a fila quando a reserva
+vence (JOBS_TIMEOUT_S).
+
+Uso:
+    python worker.py [--threads 4] [--processos 2] [--tipos importar_excel,excluir_cartao] [--ate-esvaziar]
+
+Variáveis de ambiente (além das do main.py, como DATABASE_URL e JOBS_*):
+    JOBS_THREADS     threads por processo
+    JOBS_PROCESSOS   processos do worker
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+JOBS_THREADS = int(os.getenv("JOBS_THREADS", "2"))
+JOBS_PROCESSOS = int(os.getenv("JOBS_PROCESSOS", "1"))
+# Intervalo da manutenção (jobs expirados e jobs antigos)
+MANUTENCAO_S = 60
+
+
+def executar_processo(threads, tipos, ate_esvaziar):
+    """Sobe as threads de um processo e faz a manutenção da fila até receber SIGTERM/SIGINT"""
+    import main
+
+    parar = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: parar.set())
+    signal.signal(signal.SIGINT, lambda *_: parar.set())
+
+    prefixo = f"{socket.gethostname()}:{os.getpid()}"
+    trabalhadores = [
+        threading.Thread(target=main.processar_jobs, args=(f"{prefixo}:{numero}", parar, tipos, ate_esvaziar),
+                         name=f"jobs-{numero}")
+        for numero in range(threads)
+    ]
+    main.logger.info("Worker iniciado", extra={"campos": {"worker": prefixo, "threads": threads, "tipos": tipos}})
+    main.recuperar_jobs_expirados()
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+
+    ultima_manutencao = time.monotonic()
+    while any(trabalhador.is_alive() for trabalhador in trabalhadores):
+        if time.monotonic() - ultima_manutencao >= MANUTENCAO_S:
+            try:
+                main.recuperar_jobs_expirados()
+                main.limpar_jobs_antigos()
+            except Exception:
+                main.logger.exception("Erro na manutenção da fila de jobs")
+            ultima_manutencao = time.monotonic()
+        parar.wait(1)
+        if parar.is_set():
+            # Cada thread termina o job atual antes de sair
+            for trabalhador in trabalhadores:
+                trabalhador.join()
+    main.logger.info("Worker encerrado", extra={"campos": {"worker": prefixo}})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Executa os jobs da fila (tabela jobs)")
+    parser.add_argument("--threads", type=int, default=JOBS_THREADS, help="threads por processo")
+    parser.add_argument("--processos", type=int, default=JOBS_PROCESSOS, help="processos do worker")
+    parser.add_argument("--tipos", help="executa só estes tipos de job (separados por vírgula)")
+    parser.add_argument("--ate-esvaziar", action="store_true", help="encerra quando não houver jobs disponíveis")
+    args = parser.parse_args()
+    tipos = [tipo.strip() for tipo in args.tipos.split(",")] if args.tipos else None
+
+    if args.processos <= 1:
+        executar_processo(args.threads, tipos, args.ate_esvaziar)
+        sys.exit(0)
+
+    processos = [
+        multiprocessing.get_context("spawn").Process(
+            target=executar_processo, args=(args.threads, tipos, args.ate_esvaziar)
+        )
+        for _ in range(args.processos)
+    ]
+    for processo in processos:
+        processo.start()
+    # SIGTERM no processo principal é repassado aos filhos (que terminam os jobs em andamento)
+    signal.signal(signal.SIGTERM, lambda *_: [processo.terminate() for processo in processos])
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for processo in processos:
+        processo.join()
+    sys.exit(max((processo.exitcode or 0) for processo in processos))
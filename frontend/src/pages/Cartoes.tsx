@@ -232,14 +232,14 @@ const Cartoes: React.FC = () => {
   useEffect(()=> { const carregar = async ()=> { if(!cartaoSelecionado){ setEstimativaCartaoMeses([]); return;} try { const r = await axios.get(`/cartoes/${cartaoSelecionado.id}/estimativa`, { params: { meses: 6 } }); setEstimativaCartaoMeses(r.data); } catch(e){ console.error(e);} }; carregar(); }, [cartaoSelecionado]);
 
   const totalCartaoAtual = useMemo(()=> {
-  const map: Record<string, number> = {}; meses.forEach((m: any,i: number)=> { map[m.key] = Number(estimativaCartaoMeses[i]?.valor_previsto||0); }); return map;
+  const map: Record<string, number> = {}; meses.forEach((m: any)=> { map[m.key] = 0; }); estimativaCartaoMeses.forEach((d: any)=> { const mKey = `m_${d.ano}_${d.mes}`; if(mKey in map) map[mKey] = Number(d.valor_previsto||0); }); return map;
   }, [estimativaCartaoMeses, meses]);
 
   const shouldShowParcelamento = formConta.eh_parcelado;
   // Estados adicionais (inseridos posteriormente nas melhorias)
   const [totaisAgregados, setTotaisAgregados] = useState<Record<string, number>>({});
   const [resumoFaturas, setResumoFaturas] = useState<Record<string,{pago:number;vencido:number}>>({});
-  const [resumoFaturasCartao, setResumoFaturasCartao] = useState<Record<string,{pago:number;vencido:number}>>({});
+  const [resumoFaturasPorCartao, setResumoFaturasPorCartao] = useState<Record<number, Record<string,{pago:number;vencido:number}>>>({});
   const [snackbar, setSnackbar] = useState<{open:boolean;message:string;severity:'success'|'error'|'info'|'warning'}>({open:false,message:'',severity:'info'});
   const [mostrarZeros, setMostrarZeros] = useState(false);
 
@@ -247,35 +247,38 @@ const Cartoes: React.FC = () => {
   useEffect(()=> {
     const carregar = async () => {
       const base: Record<string, number> = {}; meses.forEach((m: any)=> base[m.key]=0);
-      await Promise.all(cartoes.map(async (c: Cartao) => {
-        try { const r = await axios.get(`/cartoes/${c.id}/estimativa`, { params: { meses: 6 } });
-          r.data.forEach((d: any, idx: number)=> { const mKey = meses[idx]?.key; if(mKey) base[mKey] += Number(d.valor_previsto || 0); });
-        } catch(err){ console.error('estimativa cartao', c.id, err); }
-      }));
+      // Projeção de todos os cartões (por ciclo de fatura) em uma única chamada
+      try { const r = await axios.get('/cartoes/estimativas', { params: { meses: 6 } });
+        Object.values(r.data || {}).forEach((ciclos: any) => {
+          ciclos.forEach((d: any)=> { const mKey = `m_${d.ano}_${d.mes}`; if(mKey in base) base[mKey] += Number(d.valor_previsto || 0); });
+        });
+      } catch(err){ console.error('estimativas cartoes', err); }
       setTotaisAgregados(base);
       try {
-        const rf = await axios.get('/cartoes/resumo-faturas', { params: { meses: 6 } });
+        // Uma única chamada traz o total e o detalhamento de todos os cartões
+        const rf = await axios.get('/cartoes/resumo-faturas', { params: { meses: 6, por_cartao: true } });
         const map: Record<string,{pago:number;vencido:number}> = {};
-        rf.data.forEach((item:any)=> { const key = `m_${item.ano}_${item.mes}`; map[key] = { pago:Number(item.valor_faturas_pagas||0), vencido:Number(item.valor_faturas_pendentes_vencidas||0) }; });
+        const porCartao: Record<number, Record<string,{pago:number;vencido:number}>> = {};
+        rf.data.forEach((item:any)=> {
+          const key = `m_${item.ano}_${item.mes}`;
+          map[key] = { pago:Number(item.valor_faturas_pagas||0), vencido:Number(item.valor_faturas_pendentes_vencidas||0) };
+          Object.entries(item.por_cartao || {}).forEach(([cartaoId, valores]: [string, any]) => {
+            const id = Number(cartaoId);
+            porCartao[id] = porCartao[id] || {};
+            porCartao[id][key] = { pago:Number(valores.valor_faturas_pagas||0), vencido:Number(valores.valor_faturas_pendentes_vencidas||0) };
+          });
+        });
         setResumoFaturas(map);
+        setResumoFaturasPorCartao(porCartao);
       } catch(err){ console.error('resumo faturas', err); }
     };
-    if(cartoes.length>0) carregar(); else { setTotaisAgregados({}); setResumoFaturas({}); }
+    if(cartoes.length>0) carregar(); else { setTotaisAgregados({}); setResumoFaturas({}); setResumoFaturasPorCartao({}); }
   }, [cartoes, meses]);
 
-  // Resumo por cartão selecionado
-  useEffect(()=> {
-    const carregar = async () => {
-      if(!cartaoSelecionado){ setResumoFaturasCartao({}); return; }
-      try {
-        const r = await axios.get(`/cartoes/${cartaoSelecionado.id}/resumo-faturas`, { params: { meses: 6 } });
-        const map: Record<string,{pago:number;vencido:number}> = {};
-        r.data.forEach((item:any)=> { const key = `m_${item.ano}_${item.mes}`; map[key] = { pago:Number(item.valor_faturas_pagas||0), vencido:Number(item.valor_faturas_pendentes_vencidas||0) }; });
-        setResumoFaturasCartao(map);
-      } catch(err){ console.error('resumo faturas cartao', err); }
-    };
-    carregar();
-  }, [cartaoSelecionado]);
+  // Resumo por cartão selecionado (derivado do resumo consolidado)
+  const resumoFaturasCartao = useMemo(()=> (
+    cartaoSelecionado ? (resumoFaturasPorCartao[cartaoSelecionado.id] || {}) : {}
+  ), [cartaoSelecionado, resumoFaturasPorCartao]);
   
   const handleCloseSnackbar = (_e?: React.SyntheticEvent | Event, reason?: string) => {
     if (reason === 'clickaway') return;
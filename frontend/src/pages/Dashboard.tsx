@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import {
   Grid,
   Card,
@@ -25,6 +25,7 @@ import {
 import { DatePicker } from '@mui/x-date-pickers/DatePicker';
 import dayjs from 'dayjs';
 import axios from 'axios';
+import { useAuth } from '../services/AuthContext';
 
 interface ResumoData {
   total_pendente: number;
@@ -67,6 +68,9 @@ const Dashboard: React.FC = () => {
   const [confirmDialogOpen, setConfirmDialogOpen] = useState(false);
   const [faturaParaConfirmar, setFaturaParaConfirmar] = useState<FaturaPendente | null>(null);
   const [valorFatura, setValorFatura] = useState('');
+  const { token } = useAuth();
+  // Recarrega só os blocos afetados por um evento do backend (recursos vazio = recarregar tudo)
+  const recarregarRef = useRef<(recursos: string[]) => void>(() => {});
 
   useEffect(() => {
     const fetchResumo = async () => {
@@ -117,12 +121,36 @@ const Dashboard: React.FC = () => {
       }
     };
 
+    recarregarRef.current = (recursos: string[]) => {
+      const todos = recursos.length === 0;
+      if (todos || recursos.includes('resumo')) fetchResumo();
+      if (todos || recursos.includes('grafico')) fetchDadosGrafico();
+      if (todos || recursos.includes('faturas')) fetchFaturasPendentes();
+      if (todos || recursos.includes('vencem_hoje')) fetchContasVencemHoje();
+    };
+
     fetchResumo();
     fetchDadosGrafico();
     fetchFaturasPendentes();
     fetchContasVencemHoje();
   }, [mesAno, mostrarTodos]); // Recarregar quando o filtro de mês/ano mudar ou checkbox
 
+  // Alterações feitas em outras abas/dispositivos chegam por Server-Sent Events (GET /eventos).
+  // O EventSource não envia cabeçalhos, então o token vai na query string; a reconexão é automática.
+  useEffect(() => {
+    if (!token) return;
+    const fonte = new EventSource(`${axios.defaults.baseURL}/eventos?token=${encodeURIComponent(token)}`);
+    fonte.onmessage = (mensagem) => {
+      try {
+        const evento = JSON.parse(mensagem.data);
+        recarregarRef.current(evento.recursos || []);
+      } catch (error) {
+        console.error('Evento inválido recebido:', error);
+      }
+    };
+    return () => fonte.close();
+  }, [token]);
+
   if (loading) {
     return (
       <Box display="flex" justifyContent="center" alignItems="center" minHeight="400px">